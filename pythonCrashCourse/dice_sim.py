@@ -0,0 +1,68 @@
+# ********************** DICE SIMULATION ACROSS PROCESSES **********************
+# The chunked dice simulation from section 10 of numpy_practice.py.
+# Rolling dice in fixed-size chunks and keeping only a running histogram means peak
+# memory depends on chunk_size and NOT on N, even for N = 1,000,000,000.
+import numpy as np
+
+# To use every core we split the N trials into shards and give each worker process its
+# own random Generator. SeedSequence.spawn() derives independent streams from one seed,
+# so the same (seed, workers) pair always gives the exact same counts.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+def count_dice_shard(n, chunk_size, dtype, seed_seq):
+    """
+    Rolls n pairs of dice in chunks and returns (totals, max_is_6) counts for one shard.
+    """
+    rng = np.random.default_rng(seed_seq)   # independent stream for this shard
+    totals = np.zeros(13, dtype=np.int64)   # histogram accumulator, index = sum of dice
+    max_is_6 = 0                             # running count of trials with a 6
+    done = 0
+    while done < n:
+        size = min(chunk_size, n - done)                 # last chunk may be smaller
+        die1 = rng.integers(1, 7, size, dtype=dtype)     # chunk of die 1 rolls
+        die2 = rng.integers(1, 7, size, dtype=dtype)     # chunk of die 2 rolls
+        sums = die1 + die2                               # 2..12 still fits in int8
+        totals += np.bincount(sums, minlength=13)        # add this chunk's counts
+        max_is_6 += np.count_nonzero((die1 == 6) | (die2 == 6))
+        done += size
+    return totals, max_is_6
+
+def simulate_dice(N, chunk_size=10_000_000, dtype=np.int8, seed=None, workers=1):
+    """
+    Simulates N rolls of two dice in bounded chunks, optionally across processes.
+
+    Args:
+        N: Number of simulated trials.
+        chunk_size: Rolls generated per chunk (controls peak memory per worker).
+        dtype: Integer dtype for the rolls (int8 is plenty for values 1..6).
+        seed: Seed for reproducible results (None = fresh entropy).
+        workers: Number of processes to shard the trials across.
+
+    Returns:
+        (values, probs, p_max_6): the possible sums 2..12, their probabilities,
+        and the proportion of trials where at least one die is a 6.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(workers)              # one stream per shard
+    shards = [N // workers + (i < N % workers) for i in range(workers)]  # split N evenly
+    if workers == 1:
+        results = [count_dice_shard(shards[0], chunk_size, dtype, seeds[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(count_dice_shard, shards,
+                                    repeat(chunk_size), repeat(dtype), seeds))
+    totals = sum(r[0] for r in results)     # merge the per-shard histograms
+    max_is_6 = sum(r[1] for r in results)
+    values = np.arange(2, 13)               # possible sums
+    probs = totals[2:] / N                  # convert counts to probabilities
+    return values, probs, max_is_6 / N
+
+
+# Run this file directly to shard a billion trials across every core
+if __name__ == "__main__":
+    N = 1000000000                      # number of simulated trials
+    values, probs, max_is_6 = simulate_dice(N, seed=0, workers=os.cpu_count())
+    for v, p in zip(values, probs):      # iterate over each sum and probability
+        print(f"Sum {v:>2}: {p:.3f}")    # print nicely formatted probability per sum
+    print(f"P(max die = 6) ≈ {max_is_6:.3f}")
@@ -0,0 +1,87 @@
+# ********************** EXTERNAL MERGE SORT **********************
+# read_csv_line_by_line() from iterators_and_generators.py, for files bigger than RAM:
+#  1) read the file as a stream and cut it into "runs" of run_size lines (fits in memory)
+#  2) sort each run (in worker processes when workers > 1) and spill it to a temp file
+#  3) k-way merge the sorted runs with a heap (heapq.merge) and yield lines one at a time
+import heapq
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+def column_key(column, delimiter, cast, line):
+    """Sort key for one CSV column (a module-level function so worker processes can use it)."""
+    return cast(line.split(delimiter)[column])
+
+def sort_run_to_file(lines, key, reverse, directory):
+    """Sorts one run of lines and writes it to a temp file; returns the file path."""
+    lines.sort(key=key, reverse=reverse)
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with open(fd, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+def read_lines(filename):
+    """Yields the file's lines as they are, minus the line ending."""
+    with open(filename, "r") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+def read_run(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+def read_csv_line_by_line(filename, key=None, column=None, delimiter=",", numeric=False,
+                          run_size=100_000, workers=1, reverse=False):
+    """
+    Yields the lines of filename in sorted order, using at most ~run_size lines of memory
+    per worker.
+
+    Args:
+        key: Function mapping a line to its sort key (must be picklable if workers > 1,
+            i.e. a module-level function, not a lambda).
+        column: Instead of key, sort by this CSV column (0-based).
+        delimiter: CSV delimiter used with column.
+        numeric: Compare the column as float instead of as text.
+        run_size: Lines per sorted run (the memory budget).
+        workers: Processes used to sort runs in parallel.
+        reverse: Sort in descending order.
+    """
+    if column is not None:
+        key = partial(column_key, column, delimiter, float if numeric else str)
+    directory = tempfile.mkdtemp(prefix="extsort_")
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        run_paths, pending = [], []
+        lines = filter(str.strip, read_lines(filename))   # skip blank lines, keep the rest as-is
+        while True:
+            run = [line for _, line in zip(range(run_size), lines)]   # next run_size lines
+            if not run:
+                break
+            if pool is None:
+                run_paths.append(sort_run_to_file(run, key, reverse, directory))
+                continue
+            pending.append(pool.submit(sort_run_to_file, run, key, reverse, directory))
+            if len(pending) >= workers:           # bound how many runs sit in memory
+                run_paths.append(pending.pop(0).result())
+        run_paths.extend(future.result() for future in pending)
+        yield from heapq.merge(*(read_run(path) for path in run_paths),
+                              key=key, reverse=reverse)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+# Run this file directly to sort a small CSV of (name, score) with two worker processes
+if __name__ == "__main__":
+    import random
+    random.seed(0)
+    with open("bigdata2.txt", "w", encoding="utf-8") as f:
+        for i in range(1000):
+            f.write(f"player{i},{random.randint(0, 10_000)}\n")
+
+    for i, line in enumerate(read_csv_line_by_line("bigdata2.txt", column=1, numeric=True,
+                                                   run_size=100, workers=2)):
+        if i < 5:
+            print(line)
@@ -166,6 +166,9 @@ with open("source.txt", "r", encoding="utf-8") as src, \
 with open("copy.txt", "r", encoding="utf-8") as f:
     print("Copied:\n" + f.read())
 
+# For big files, copy the raw bytes instead of looping over lines:
+# see copy_file() in the utilities below.
+
 
 # =======================================
 # Practice !!!
@@ -199,10 +202,415 @@ def read_first_n(path, n=5, encoding="utf-8"):
                 break
     return out
 
+import time
+from itertools import islice, repeat
+
+def write_lines_bulk(path, lines, mode="w", encoding="utf-8", buffer_size=1 << 20,
+                     flush_interval=None, batch_lines=10_000):
+    """
+    Write an iterable of str or bytes lines, each on its own line, in big batches.
+
+    write_lines() checks and writes one line per loop step. Here lines are taken
+    batch_lines at a time, joined with a single "\n".join, and written once about
+    buffer_size bytes are pending, so hundreds of millions of lines only cost a
+    few thousand writes. bytes lines are written as-is (no encoding step).
+    If flush_interval (seconds) is set, batches are cut short when the interval
+    runs out, and whatever is pending gets written and flushed to the OS, so readers
+    (e.g. tail(follow=True)) see it while a slow producer is still running. The
+    clock is checked as each line arrives: a line stays pending until the next one
+    comes in (or lines runs out).
+    Returns the number of lines written.
+    """
+    count = 0
+    pending, pending_size = [], 0
+    deadline = None if flush_interval is None else time.monotonic() + flush_interval
+    it = iter(lines)
+    with open(path, mode.replace("b", "") + "b") as f:
+        while True:
+            batch = take_batch(it, batch_lines, deadline)
+            if not batch:
+                break
+            count += len(batch)
+            if not all(map(isinstance, batch, repeat(bytes))):   # map() keeps the loop in C
+                # str (or mixed) batch: encode everything once, as one string
+                batch = [line if isinstance(line, str) else line.decode(encoding) for line in batch]
+                newline, endswith = "\n", str.endswith
+            else:
+                newline, endswith = b"\n", bytes.endswith
+            if any(map(endswith, batch, repeat(newline))):
+                # Some lines already end in a newline: only add it where it's missing
+                batch = [line if line.endswith(newline) else line + newline for line in batch]
+                data = batch[0][:0].join(batch)
+            else:
+                # Fast path: no line has its own newline, so one join does it all
+                data = newline.join(batch) + newline
+            if newline == "\n":
+                data = data.encode(encoding)
+            pending.append(data)
+            pending_size += len(data)
+            due = deadline is not None and time.monotonic() >= deadline
+            if pending_size >= buffer_size or due:
+                f.write(b"".join(pending))
+                pending, pending_size = [], 0
+            if due:
+                f.flush()
+                deadline = time.monotonic() + flush_interval
+        f.write(b"".join(pending))
+    return count
+
+def take_batch(it, batch_lines, deadline=None):
+    """Up to batch_lines items from it, stopping early once time.monotonic() passes deadline."""
+    if deadline is None:
+        return list(islice(it, batch_lines))          # no time limit: let islice do it in C
+    batch = []
+    for line in it:
+        batch.append(line)
+        if len(batch) >= batch_lines or time.monotonic() >= deadline:
+            break
+    return batch
+
+def tail(path, n=10, encoding="utf-8", follow=False, block_size=8192, poll_interval=0.2):
+    """
+    Read only the last n lines (cost depends on n, not on the file size).
+
+    We seek to the end and read fixed-size blocks BACKWARDS until we have seen
+    enough newlines, so a multi-GB log only costs a few small reads.
+
+    With follow=True (like `tail -f`) this returns a generator instead of a list:
+    it yields the last n lines, then every new line appended to the file,
+    reopening the file if it is rotated (replaced) or truncated.
+    """
+    if follow:
+        return follow_lines(path, n, encoding, block_size, poll_interval)
+    with open(path, "rb") as f:
+        return last_lines(f, n, encoding, block_size)
+
+def last_lines(f, n, encoding, block_size):
+    """Return the last n lines of the binary file f, leaving f at the end."""
+    end = f.seek(0, os.SEEK_END)
+    pos, data = end, b""
+    # n lines need n newlines, plus one more if the file ends with "\n"
+    while pos > 0 and data.count(b"\n") <= n:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        data = f.read(step) + data
+    f.seek(end)
+    if n <= 0 or not data:
+        return []
+    text = data.decode(encoding, errors="replace")
+    if text.endswith("\n"):
+        text = text[:-1]                      # the last line's own newline, not an empty line
+    # Split on "\n" only (str.splitlines() also breaks on \x0c, \x1c, \u2028, ...) and
+    # drop the "\r" of "\r\n" endings, so lines come out like read_first_n's
+    return [line.rstrip("\r") for line in text.split("\n")[-n:]]
+
+def follow_lines(path, n, encoding, block_size, poll_interval):
+    """Generator behind tail(follow=True)."""
+    f = open(path, "rb")
+    try:
+        yield from last_lines(f, n, encoding, block_size)
+        partial = b""
+        while True:
+            chunk = f.readline()
+            if chunk:
+                partial += chunk
+                if partial.endswith(b"\n"):      # only yield complete lines
+                    yield partial.decode(encoding, errors="replace").rstrip("\r\n")
+                    partial = b""
+                continue
+            # No new data: check whether the log was rotated or truncated
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                st = None                      # mid-rotation, try again shortly
+            if st is not None and (st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell()):
+                f.close()
+                f = open(path, "rb")           # start reading the new file from the top
+                partial = b""
+                continue
+            time.sleep(poll_interval)
+    finally:
+        f.close()
+
+import shutil
+
+def copy_file(src, dst, start=0, length=None, progress=None, block_size=8 << 20):
+    """
+    Copy bytes start..start+length of src into dst (the whole file by default).
+
+    Copying line by line decodes and re-encodes every byte in Python. Here the
+    kernel moves the bytes itself when it can (os.copy_file_range, then
+    os.sendfile), and otherwise we copy in large blocks into a reused buffer.
+    progress, if given, is called as progress(bytes_copied, bytes_total) after every block.
+    Returns the number of bytes copied.
+    Raises shutil.SameFileError if src and dst are the same file (like shutil.copyfile).
+    """
+    # Opening dst with "wb" would truncate src before a single byte is read
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        size = os.fstat(fin.fileno()).st_size
+        total = max(0, size - start if length is None else min(length, size - start))
+        copied = 0
+        kernel_copies = [name for name in ("copy_file_range", "sendfile") if hasattr(os, name)]
+        while copied < total and kernel_copies:
+            count = min(block_size, total - copied)
+            try:
+                if kernel_copies[0] == "copy_file_range":
+                    sent = os.copy_file_range(fin.fileno(), fout.fileno(), count, start + copied)
+                else:
+                    sent = os.sendfile(fout.fileno(), fin.fileno(), start + copied, count)
+            except OSError:
+                kernel_copies.pop(0)          # not supported here, try the next method
+                continue
+            if sent == 0:                     # file got shorter while copying
+                total = copied
+                break
+            copied += sent
+            if progress:
+                progress(copied, total)
+        # Fallback: plain buffered copy, reusing one buffer (no new bytes objects)
+        if copied < total:
+            fin.seek(start + copied)
+            fout.seek(copied)
+            buf = memoryview(bytearray(block_size))
+            while copied < total:
+                n = fin.readinto(buf[:min(block_size, total - copied)])
+                if not n:
+                    break
+                fout.write(buf[:n])
+                copied += n
+                if progress:
+                    progress(copied, total)
+    return copied
+
+from array import array
+from hashlib import blake2b
+import numpy as np
+
+class LineIndex:
+    """
+    Random access to line k of a huge text file with a single seek.
+
+    One pass over the file records where every line starts (8 bytes per line,
+    in a compact array). The offsets are saved next to the file as a sidecar
+    (path + ".idx") and reused. The sidecar also keeps the file's inode and a
+    hash of the first and last 4 KiB that were indexed: if they still match, the
+    file was only appended to and just the new part is scanned (and only the new
+    offsets are written). If the file was replaced, truncated or rewritten, the
+    index is rebuilt.
+    """
+
+    MAGIC = int.from_bytes(b"LINEIDX2", "little")   # first word of a sidecar file
+    HEADER = 4                                      # MAGIC, size, inode, signature
+
+    def __init__(self, path, index_path=None, encoding="utf-8", block_size=1 << 20):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.encoding = encoding
+        self.block_size = block_size
+        self.starts = array("Q", [0])   # byte offset where each line starts
+        self.size = 0                   # how many bytes of the file are indexed
+        self.inode = None               # which file was indexed
+        self.signature = 0              # hash of the indexed bytes (see fingerprint)
+        self.saved = 0                  # how many of the starts are in the sidecar
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            saved = array("Q")
+            saved.frombytes(data[:len(data) - len(data) % saved.itemsize])
+            if len(saved) > self.HEADER and saved[0] == self.MAGIC:
+                _, self.size, self.inode, self.signature = saved[:self.HEADER]
+                self.starts = saved[self.HEADER:]
+                while self.starts[-1] > self.size:
+                    self.starts.pop()   # written by an update that didn't finish
+                self.saved = len(self.starts)
+        self.update()
+
+    def fingerprint(self, size):
+        """Hash of the first and last 4 KiB of the file's first size bytes."""
+        h = blake2b(digest_size=8)
+        with open(self.path, "rb") as f:
+            h.update(f.read(min(size, 4096)))
+            f.seek(max(size - 4096, 0))
+            h.update(f.read(size - f.tell()))
+        return int.from_bytes(h.digest(), "little")
+
+    def update(self):
+        """Index any lines appended since the last pass (rebuild if the file changed otherwise)."""
+        st = os.stat(self.path)
+        if (st.st_ino != self.inode or st.st_size < self.size
+                or self.fingerprint(self.size) != self.signature):
+            self.starts, self.size, self.saved = array("Q", [0]), 0, 0
+        elif st.st_size == self.size:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.size)
+            pos = self.size
+            while True:
+                block = f.read(self.block_size)
+                if not block:
+                    break
+                # Find every "\n" of the block at once; the next line starts right after it
+                newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == ord("\n"))
+                self.starts.frombytes((newlines + (pos + 1)).astype(np.uint64).tobytes())
+                pos += len(block)
+        self.size = pos
+        self.inode = st.st_ino
+        self.signature = self.fingerprint(self.size)
+        self.save()
+
+    def save(self):
+        """Write the sidecar: only the new offsets plus the header when it already exists."""
+        header = array("Q", [self.MAGIC, self.size, self.inode, self.signature])
+        if self.saved == 0:
+            with open(self.index_path, "wb") as f:
+                header.tofile(f)
+                self.starts.tofile(f)
+        else:
+            with open(self.index_path, "r+b") as f:
+                f.seek((self.HEADER + self.saved) * header.itemsize)
+                self.starts[self.saved:].tofile(f)   # append the new offsets ...
+                f.truncate()
+                f.seek(0)
+                header.tofile(f)                      # ... then record the new size
+        self.saved = len(self.starts)
+
+    def __len__(self):
+        # The last start is only a line if there is text after the final "\n"
+        return len(self.starts) - (self.starts[-1] == self.size)
+
+    def get_lines(self, a, b):
+        """Return lines a..b-1 (like list slicing) with one seek and one read."""
+        a, b, _ = slice(a, b).indices(len(self))
+        if a >= b:
+            return []
+        end = self.starts[b] if b < len(self.starts) else self.size
+        with open(self.path, "rb") as f:
+            f.seek(self.starts[a])
+            data = f.read(end - self.starts[a])
+        text = data.decode(self.encoding)
+        if text.endswith("\n"):
+            text = text[:-1]
+        lines = text.split("\n")   # same line breaks as the index (not str.splitlines)
+        if "\r" in text:
+            lines = [line.rstrip("\r") for line in lines]   # "\r\n" endings, like read_first_n
+        return lines
+
+    def get_line(self, k):
+        """Return line k (0-based, negative counts from the end)."""
+        if not -len(self) <= k < len(self):
+            raise IndexError("line index out of range")
+        k %= len(self)
+        return self.get_lines(k, k + 1)[0]
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+class AsyncFileIO:
+    """
+    Awaitable file reads/writes for reading or writing many files concurrently.
+
+    Regular file I/O blocks, so each call runs in a worker thread. At most
+    max_workers files are open at once; while one waits on the disk, the
+    others make progress, so total time follows I/O parallelism rather than
+    the sum of per-file latencies.
+
+        async with AsyncFileIO() as fio:
+            async for path, text in fio.read_many(paths):
+                ...
+    """
+
+    def __init__(self, max_workers=32):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.limit = asyncio.Semaphore(max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Wait for the pool to finish without blocking the event loop."""
+        # shutdown(wait=True) blocks until every worker exits, so run it in the
+        # loop's default pool (not self.executor, which is the one shutting down)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
+
+    def close(self):
+        """Blocking shutdown, for use outside a running event loop."""
+        self.executor.shutdown(wait=True)
+
+    async def run(self, func, *args):
+        """Run a blocking func(*args) in the pool, respecting the concurrency limit."""
+        async with self.limit:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def read(self, path, mode="r", encoding="utf-8"):
+        """Read a whole file (str, or bytes with mode="rb")."""
+        def read_all():
+            with open(path, mode, encoding=None if "b" in mode else encoding) as f:
+                return f.read()
+        return await self.run(read_all)
+
+    async def write(self, path, data, mode="w", encoding="utf-8"):
+        """Write str (or bytes with mode="wb"/"ab") to a file."""
+        def write_all():
+            with open(path, mode, encoding=None if "b" in mode else encoding) as f:
+                return f.write(data)
+        return await self.run(write_all)
+
+    async def iter_lines(self, path, encoding="utf-8", batch_lines=1000):
+        """Async generator over the lines of a file (without "\n").
+        Lines are read batch_lines at a time per thread hop to keep overhead low."""
+        f = await self.run(open, path, "r", -1, encoding)
+        try:
+            while True:
+                batch = await self.run(lambda: list(islice(f, batch_lines)))
+                if not batch:
+                    break
+                for line in batch:
+                    yield line.rstrip("\n")
+        finally:
+            f.close()
+
+    async def read_many(self, paths, mode="r", encoding="utf-8"):
+        """Read many files concurrently, yielding (path, contents) as each one finishes."""
+        async def read_one(path):
+            return path, await self.read(path, mode, encoding)
+        for done in asyncio.as_completed([read_one(p) for p in paths]):
+            yield await done
+
 # Demo of utilities
 write_lines("practice.txt", ["one", "two", "three"])
 write_lines("practice.txt", ["four", "five"], mode="a")  # append
 print("First 3 lines:", read_first_n("practice.txt", 3))
+print("Last 2 lines:", tail("practice.txt", 2))
+copy_file("practice.txt", "practice_copy.txt")   # byte copy, done by the kernel when possible
+index = LineIndex("practice.txt")       # one pass, saved to practice.txt.idx
+print("Line 3 via index:", index.get_line(3), "| lines 1-2:", index.get_lines(1, 3))
+
+async def async_demo():
+    async with AsyncFileIO(max_workers=4) as fio:
+        await fio.write("async_demo.txt", "written\nby a thread\n")
+        async for p, text in fio.read_many(["practice.txt", "words.txt", "async_demo.txt"]):
+            print(f"[async] {p}: {len(text.splitlines())} lines")
+        print("[async] lines:", [line async for line in fio.iter_lines("async_demo.txt")])
+
+asyncio.run(async_demo())
+
+# Quick benchmark: one write per line vs batched writes
+records = [f"record {i}" for i in range(500_000)]
+start = time.perf_counter()
+write_lines("bench.txt", records)
+middle = time.perf_counter()
+write_lines_bulk("bench.txt", records)
+end = time.perf_counter()
+print(f"write_lines:      {len(records) / (middle - start):,.0f} lines/sec")
+print(f"write_lines_bulk: {len(records) / (end - middle):,.0f} lines/sec")
 
 
 # =======================================
@@ -11,6 +11,8 @@
 # When Python runs out of items, __next__() raises StopIteration to signal “we’re done.”
 # https://www.w3schools.com/python/python_iterators.asp
 
+import numpy as np   # used for the block (array-at-a-time) iterators below
+
 # We will Define a class that will behave like an iterator
 class CountDown:
     # __init__ is the constructor; it runs when the object is created
@@ -34,6 +36,15 @@ class CountDown:
         # Return the saved number
         return num
 
+    # iter_blocks() hands out the SAME numbers, but as NumPy arrays of block_size items.
+    # One array per step instead of one Python int per step is much faster for huge counts.
+    def iter_blocks(self, block_size=1 << 20, dtype=np.int64):
+        while self.current > 0:
+            stop = max(self.current - block_size, 0)         # where this block ends
+            block = np.arange(self.current, stop, -1, dtype=dtype)   # current, ..., stop+1
+            self.current = stop                              # remember where we are
+            yield block
+
 # Create an iterator object that counts down from 5
 for number in CountDown(5):
     # Each loop automatically calls __next__() until StopIteration
@@ -50,6 +61,14 @@ def countdown(n):
 for number in countdown(3):
     print(number)
 
+# The generator version of CountDown.iter_blocks(): the same countdown, block_size numbers
+# at a time as NumPy arrays
+def countdown_blocks(n, block_size=1 << 20, dtype=np.int64):
+    while n > 0:
+        stop = max(n - block_size, 0)
+        yield np.arange(n, stop, -1, dtype=dtype)   # n, n-1, ..., stop+1
+        n = stop
+
 
 # Define a generator function that yields even numbers up to a limit
 def even_numbers(limit):
@@ -73,6 +92,68 @@ for value in even_numbers(10):
 
 
 
+# ***************************************************************
+# Block iteration (for billions of items)
+# ***************************************************************
+# Every item from a generator costs a trip through the Python interpreter.
+# A "block iterator" has an iter_blocks(block_size) method that yields NumPy arrays
+# instead, so the work per item happens in C. Consumers pick: for x in seq (per item)
+# or for block in iter_blocks(seq) (per block).
+import time
+from itertools import islice
+
+class EvenNumbers:
+    """Even numbers 0, 2, 4, ... up to limit, one at a time or in NumPy blocks."""
+
+    def __init__(self, limit):
+        self.current = 0
+        self.limit = limit
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.current > self.limit:
+            raise StopIteration
+        num = self.current
+        self.current += 2            # step by 2 instead of testing every number with % 2
+        return num
+
+    def iter_blocks(self, block_size=1 << 20, dtype=np.int64):
+        while self.current <= self.limit:
+            stop = min(self.current + 2 * block_size, self.limit + 1)
+            block = np.arange(self.current, stop, 2, dtype=dtype)   # stride of 2, no filtering
+            self.current += 2 * block.size
+            yield block
+
+def iter_blocks(seq, block_size=1 << 20, dtype=np.int64):
+    """
+    Yields NumPy arrays of up to block_size items from seq.
+    Uses seq.iter_blocks() when seq supports it, otherwise packs its items into arrays.
+    Either way the blocks have the given dtype.
+    """
+    if hasattr(seq, "iter_blocks"):
+        yield from seq.iter_blocks(block_size, dtype=dtype)
+        return
+    it = iter(seq)
+    while True:
+        block = np.fromiter(islice(it, block_size), dtype=dtype)
+        if block.size == 0:
+            return
+        yield block
+
+print("blocks:", list(iter_blocks(EvenNumbers(10), block_size=4)))
+print("blocks:", list(iter_blocks(countdown(5), block_size=2)))   # plain generators work too
+print("blocks:", list(countdown_blocks(5, block_size=2, dtype=np.int32)))
+
+start = time.perf_counter()
+total_items = sum(EvenNumbers(10_000_000))
+middle = time.perf_counter()
+total_blocks = sum(int(block.sum()) for block in iter_blocks(EvenNumbers(10_000_000)))
+end = time.perf_counter()
+print(f"per item:  {total_items} in {middle - start:.3f}s")
+print(f"per block: {total_blocks} in {end - middle:.3f}s")
+
 # Generator expressions
 squares = (x*x for x in range(5))  # generator expression
 
@@ -94,5 +175,83 @@ def read_file_line_by_line(filename):
 for line in read_file_line_by_line("bigdata.txt"):
     print(line)   # prints one line at a time
 
+
+# For really big files (tens of GB) the generator above spends most of its time on
+# per-line work: decoding, strip(), and one Python-level step per line.
+# A faster reader grabs a big binary block, splits it on b"\n" all at once, and can
+# hand back whole batches of lines instead of one line per loop step.
+def read_file_lines_fast(filename, block_size=1 << 20, batch=False, encoding="utf-8"):
+    """
+    Yields the stripped lines of a file, reading block_size bytes at a time.
+
+    Args:
+        batch: If True, yield a list of lines per block instead of single lines.
+        encoding: Text encoding, or None to get bytes lines (skips decoding).
+    """
+    leftover = b""                        # a line cut in half at the end of a block
+    with open(filename, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            data = leftover + block
+            cut = data.rfind(b"\n")
+            if cut == -1:                 # no complete line yet, keep reading
+                leftover = data
+                continue
+            leftover = data[cut + 1:]     # last piece may continue in the next block
+            data = data[:cut]
+            if encoding is not None:
+                # decode the whole block at once: safe because we only cut at b"\n"
+                lines = list(map(str.strip, data.decode(encoding).split("\n")))
+            else:
+                lines = list(map(bytes.strip, data.split(b"\n")))
+            if batch:
+                yield lines
+            else:
+                yield from lines
+    if leftover:
+        last = leftover.decode(encoding).strip() if encoding is not None else leftover.strip()
+        if batch:
+            yield [last]
+        else:
+            yield last
+
+# Same lines as read_file_line_by_line, timed on a bigger copy of bigdata.txt
+with open("bigdata.txt", "rb") as src, open("bigdata_x1000.txt", "wb") as dst:
+    dst.write(src.read() * 1000)
+start = time.perf_counter()
+slow_count = sum(1 for line in read_file_line_by_line("bigdata_x1000.txt"))
+middle = time.perf_counter()
+fast_count = sum(len(lines) for lines in read_file_lines_fast("bigdata_x1000.txt", batch=True))
+end = time.perf_counter()
+bytes_count = sum(len(lines) for lines in read_file_lines_fast("bigdata_x1000.txt", batch=True, encoding=None))
+bytes_end = time.perf_counter()
+same = list(read_file_line_by_line("bigdata.txt")) == list(read_file_lines_fast("bigdata.txt"))
+print(f"read_file_line_by_line:           {slow_count / (middle - start):,.0f} lines/sec")
+print(f"read_file_lines_fast(batch=True): {fast_count / (end - middle):,.0f} lines/sec, same lines: {same}")
+print(f"  ... with encoding=None (bytes): {bytes_count / (bytes_end - end):,.0f} lines/sec")
+
 # define your own function called read_csv_line_by_line() that can take in the bigdata2.txt,
-# and displays the data, sorted. you can use python's built in sorts like .sort()
\ No newline at end of file
+# and displays the data, sorted. you can use python's built in sorts like .sort()
+
+# Here is a version that works even when the file is bigger than RAM: an EXTERNAL merge sort.
+#  1) read the file as a stream and cut it into "runs" of run_size lines (fits in memory)
+#  2) sort each run (optionally in parallel worker processes) and spill it to a temp file
+#  3) k-way merge the sorted runs with a heap (heapq.merge) and yield lines one at a time
+# The sort lives in extsort.py. Here the runs are sorted in this process; `python extsort.py`
+# sorts them in worker processes instead.
+from extsort import read_csv_line_by_line
+
+# Demo: sort a small CSV of (name, score) by the numeric score column
+import random
+random.seed(0)
+with open("bigdata2.txt", "w", encoding="utf-8") as f:
+    for i in range(1000):
+        f.write(f"player{i},{random.randint(0, 10_000)}\n")
+    f.write("\n")                   # a trailing blank line is skipped, not parsed
+
+for i, line in enumerate(read_csv_line_by_line("bigdata2.txt", column=1, numeric=True,
+                                               run_size=100)):
+    if i < 5:
+        print(line)
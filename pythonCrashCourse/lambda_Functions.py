@@ -61,6 +61,184 @@ sum_all = reduce(lambda x, y: x + y, nums)
 print("Sum with reduce:", sum_all)
 
 
+# =======================================
+# Fused Pipelines (map + filter, fast)
+# =======================================
+# Chaining map(lambda ...) and filter(lambda ...) over a big file works, but every layer
+# adds another Python step per item. Pipeline collects the stages first and then FUSES
+# them into one generated loop, run on batches of items:
+#
+#     for x in batch:
+#         x = stage0(x)
+#         if not stage1(x): continue
+#         x = stage2(x)
+#         out.append(x)
+#
+# With prefetch > 0 a reader thread fills a bounded queue with batches (backpressure:
+# it waits when the consumer falls behind). stats holds per-stage item counts and time.
+import queue
+import threading
+import time
+from itertools import islice
+
+class Pipeline:
+    """Lazy, fused map/filter pipeline over any iterable (e.g. a line reader)."""
+
+    def __init__(self, source, batch_size=1024, prefetch=0):
+        self.source = source
+        self.batch_size = batch_size
+        self.prefetch = prefetch        # max batches waiting in the queue (0 = no thread)
+        self.stages = []                # (kind, func, name)
+        self.stats = {}
+
+    def map(self, func, name=None):
+        self.stages.append(("map", func, name or f"map{len(self.stages)}"))
+        return self                     # return self so calls can be chained
+
+    def filter(self, func, name=None):
+        self.stages.append(("filter", func, name or f"filter{len(self.stages)}"))
+        return self
+
+    def compile(self):
+        """Builds one function that runs every stage on a batch in a single loop."""
+        code = ["def fused(batch):", "    out = []", "    append = out.append"]
+        code += [f"    n{i} = 0" for i, st in enumerate(self.stages) if st[0] == "filter"]
+        code.append("    for x in batch:")
+        for i, (kind, _, _) in enumerate(self.stages):
+            if kind == "map":
+                code.append(f"        x = f{i}(x)")
+            else:
+                code.append(f"        if not f{i}(x): continue")
+                code.append(f"        n{i} += 1")
+        code.append("        append(x)")
+        counts = ", ".join(f"n{i}" for i, st in enumerate(self.stages) if st[0] == "filter")
+        code.append(f"    return out, ({counts}{',' if counts else ''})")
+        namespace = {f"f{i}": func for i, (_, func, _) in enumerate(self.stages)}
+        exec("\n".join(code), namespace)
+        return namespace["fused"]
+
+    def read_batches(self):
+        """Yields lists of batch_size source items (from a reader thread if prefetch > 0)."""
+        it = iter(self.source)
+        if not self.prefetch:
+            while True:
+                batch = list(islice(it, self.batch_size))
+                if not batch:
+                    return
+                yield batch
+        q = queue.Queue(maxsize=self.prefetch)
+        done = object()                  # marks the end of the source
+        stop = threading.Event()         # set if the consumer stops early
+
+        def reader():
+            try:
+                while not stop.is_set():
+                    batch = list(islice(it, self.batch_size))
+                    q.put(batch or done)  # blocks when the queue is full (backpressure)
+                    if not batch:
+                        return
+            except Exception as exc:      # hand reader errors to the consumer
+                q.put(exc)
+
+        threading.Thread(target=reader, daemon=True).start()
+        try:
+            while True:
+                batch = q.get()
+                if batch is done:
+                    return
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            stop.set()
+            while not q.empty():          # unblock the reader if it is waiting on put()
+                q.get_nowait()
+
+    def iter_batches(self, profile=False):
+        """
+        Yields lists of output items, one per input batch.
+        profile=True runs each stage separately so stats also gets per-stage time
+        (slower; the normal fused run only times the source and the whole fused loop,
+        so the stages get item counts but no "seconds" entry).
+        """
+        self.stats = {"source": {"items": 0, "seconds": 0.0}}
+        for _, _, name in self.stages:
+            self.stats[name] = {"items": 0, "seconds": 0.0} if profile else {"items": 0}
+        self.stats["fused"] = {"items": 0, "seconds": 0.0}
+        fused = self.compile()
+        batches = self.read_batches()
+        while True:
+            t0 = time.perf_counter()
+            batch = next(batches, None)
+            t1 = time.perf_counter()
+            if batch is None:
+                return
+            self.stats["source"]["items"] += len(batch)
+            self.stats["source"]["seconds"] += t1 - t0
+            if profile:
+                out = batch
+                for kind, func, name in self.stages:
+                    t = time.perf_counter()
+                    out = list(map(func, out)) if kind == "map" else list(filter(func, out))
+                    self.stats[name]["seconds"] += time.perf_counter() - t
+                    self.stats[name]["items"] += len(out)
+            else:
+                out, filter_counts = fused(batch)
+                count, counts = len(batch), iter(filter_counts)
+                for kind, _, name in self.stages:
+                    count = next(counts) if kind == "filter" else count
+                    self.stats[name]["items"] += count
+            self.stats["fused"]["items"] += len(out)
+            self.stats["fused"]["seconds"] += time.perf_counter() - t1
+            yield out
+
+    def __iter__(self):
+        for out in self.iter_batches():
+            yield from out
+
+    def report(self):
+        for name, st in self.stats.items():
+            seconds = f"{st['seconds']:8.4f}s" if "seconds" in st else "not measured (use profile=True)"
+            print(f"  {name:>10}: {st['items']:>10,} items {seconds}")
+
+# A 5-stage pipeline vs the same stages as chained generators and as one hand-written loop
+def fused_by_hand(data, add5, even, double, not_div3, plus1):   # everything fused by hand
+    out = []
+    for x in data:
+        x = add5(x)
+        if not even(x):
+            continue
+        x = double(x)
+        if not_div3(x):
+            out.append(plus1(x))
+    return out
+
+add5, even, double, not_div3, plus1 = (lambda x: x + 5, lambda x: x % 2 == 0,
+                                       lambda x: x * 2, lambda x: x % 3 != 0, lambda x: x + 1)
+data = range(1_000_000)
+
+t0 = time.perf_counter()
+stage1 = (add5(x) for x in data)            # one generator layer per stage
+stage2 = (x for x in stage1 if even(x))
+stage3 = (double(x) for x in stage2)
+stage4 = (x for x in stage3 if not_div3(x))
+chained = [plus1(x) for x in stage4]
+
+t1 = time.perf_counter()
+by_hand = fused_by_hand(data, add5, even, double, not_div3, plus1)
+
+t2 = time.perf_counter()
+# prefetch=0 here: a reader thread only pays off when the source waits on I/O (e.g. files)
+pipe = (Pipeline(data, batch_size=4096)
+        .map(add5, "add5").filter(even, "even").map(double, "double")
+        .filter(not_div3, "not_div3").map(plus1, "plus1"))
+fused_result = list(pipe)
+t3 = time.perf_counter()
+print(f"generators: {t1 - t0:.3f}s, hand-fused: {t2 - t1:.3f}s, Pipeline: {t3 - t2:.3f}s, "
+      f"same result: {chained == by_hand == fused_result}")
+pipe.report()
+
+
 # =======================================
 # Higher-Order Functions Practice !!!
 # =======================================
@@ -85,6 +263,31 @@ odds = list(filter(is_odd, nums))
 print("Odd numbers (named function):", odds)
 
 
+# =======================================
+# Parallel map / filter / reduce
+# =======================================
+# map, filter and reduce run on ONE core. For hundreds of millions of items we can split
+# the input into chunks and let a pool of processes work on the chunks at the same time.
+# Notes:
+#  - functions sent to other processes must be picklable: named functions like
+#    square and is_odd work, lambdas do not
+#  - small inputs just run serially, so short calls don't pay to start a pool
+#  - reduce needs an ASSOCIATIVE function ((a+b)+c == a+(b+c)): each chunk is reduced
+#    on its own, then the partial results are combined pairwise in a tree
+# The helpers live in parallel_tools.py (`python parallel_tools.py` runs them in worker
+# processes). With workers=1 they take the same chunked path without starting a pool.
+from parallel_tools import parallel_map, parallel_filter, parallel_reduce
+
+def add(x, y):
+    return x + y
+
+big = range(200_000)
+print("parallel_map == map:", parallel_map(square, big, workers=1) == list(map(square, big)))
+print("parallel_filter == filter:", parallel_filter(is_odd, big, workers=1) == list(filter(is_odd, big)))
+print("parallel_reduce:", parallel_reduce(add, big, workers=1), "reduce:", reduce(add, big))
+print("small input runs serially:", parallel_map(square, nums))
+
+
 # =======================================
 # Functions Returning Functions
 # =======================================
@@ -100,6 +303,56 @@ triple = make_multiplier(3)
 print("Double 5:", double(5))
 print("Triple 5:", triple(5))
 
+# make_multiplier's lambda handles one number per call, so map(double, values) makes a
+# Python call for every value. The vectorized version returns a callable that ALSO
+# accepts whole arrays/lists and handles them with a single NumPy operation.
+# Kernels are cached by (operation, n): asking for make_vectorized("mul", 2) again
+# returns the exact same function instead of building a new one. typed=True keeps
+# n=2, n=2.0 and n=True apart (they are == and hash alike, but give different results).
+import operator
+import numpy as np
+from functools import lru_cache
+
+VECTOR_OPS = {
+    "mul": (operator.mul, np.multiply),
+    "add": (operator.add, np.add),
+    "sub": (operator.sub, np.subtract),
+    "div": (operator.truediv, np.true_divide),
+    "pow": (operator.pow, np.power),
+}
+
+@lru_cache(maxsize=None, typed=True)
+def make_vectorized(op, n):
+    """Returns f(x) = x <op> n that works on single numbers and on whole arrays."""
+    scalar_op, ufunc = VECTOR_OPS[op]
+
+    def kernel(x, out=None):
+        if isinstance(x, (np.ndarray, list, tuple)):
+            return ufunc(x, n, out=out)      # one vectorized call for every element
+        return scalar_op(x, n)               # plain Python number, same as the lambda
+    kernel.__name__ = f"{op}_{n}"
+    return kernel
+
+def make_multiplier_vectorized(n):
+    return make_vectorized("mul", n)
+
+def make_adder_vectorized(n):
+    return make_vectorized("add", n)
+
+double_v = make_multiplier_vectorized(2)
+print("Double 5 (vectorized):", double_v(5))
+print("Double array:", double_v(np.arange(5)))
+print("Cached kernel reused:", make_multiplier_vectorized(2) is double_v)
+
+values = np.arange(1_000_000)
+start = time.perf_counter()
+mapped = list(map(double, values.tolist()))
+middle = time.perf_counter()
+vectorized = double_v(values)
+end = time.perf_counter()
+print(f"map(lambda): {middle - start:.4f}s, vectorized: {end - middle:.4f}s, "
+      f"same: {mapped == vectorized.tolist()}")
+
 
 # =======================================
 # Functions Returning Functions Practice
@@ -1,44 +1,443 @@
+import time
 import numpy as np
+from itertools import islice
 
 
-def train_linear_regression(X, y):
+def solve_triangular(T, b, lower=True):
+    """
+    Solves T @ x = b for a triangular T by forward (lower) or back (upper) substitution.
+    Costs O(d^2), unlike np.linalg.solve, which would factorize T again in O(d^3).
+    """
+    x = np.array(b, dtype=float)    # works for a vector b or a matrix of right-hand sides
+    d = T.shape[0]
+    for i in (range(d) if lower else range(d - 1, -1, -1)):
+        done = slice(0, i) if lower else slice(i + 1, d)   # rows already solved
+        x[i] = (x[i] - T[i, done] @ x[done]) / T[i, i]
+    return x
+
+
+def solve_cholesky(gram, Xty, max_cond=None):
+    """
+    Solves gram @ theta = Xty for a symmetric positive definite gram (= X^T X).
+    Factorizes gram = L @ L.T once, then solves L @ z = Xty and L.T @ theta = z.
+    Raises np.linalg.LinAlgError if gram is not positive definite, or if max_cond
+    is given and the estimated condition number of gram is larger than it.
+    """
+    L = np.linalg.cholesky(gram)
+    if max_cond is not None:
+        # (max/min of diag(L))^2 is a cheap lower bound on cond(gram), no extra SVD needed
+        diag = np.diag(L)
+        if (diag.max() / diag.min()) ** 2 > max_cond:
+            raise np.linalg.LinAlgError("gram is badly conditioned")
+    z = solve_triangular(L, Xty, lower=True)
+    return solve_triangular(L.T, z, lower=False)
+
+
+def solve_qr(X_b, y):
+    """
+    Solves the least-squares problem with a QR factorization (X_b = Q @ R).
+    Raises np.linalg.LinAlgError if X_b does not have full column rank.
+    """
+    Q, R = np.linalg.qr(X_b)
+    diag = np.abs(np.diag(R))
+    if diag.min() <= diag.max() * max(X_b.shape) * np.finfo(float).eps:
+        raise np.linalg.LinAlgError("X_b is rank deficient")
+    return np.linalg.solve(R, Q.T @ y)
+
+
+def solve_lstsq(X_b, y):
+    """
+    Solves the least-squares problem with an SVD (np.linalg.lstsq).
+    Always succeeds; rank-deficient input gives the minimum-norm solution.
+    """
+    return np.linalg.lstsq(X_b, y, rcond=None)[0]
+
+
+SOLVERS = ("auto", "cholesky", "qr", "svd", "lstsq")
+
+
+def train_linear_regression(X, y, solver="auto"):
     """
     Trains a linear regression model using the normal equation.
 
     Args:
         X: Feature matrix (numpy array).
         y: Target vector (numpy array).
+        solver: One of SOLVERS.
+            "cholesky" - fast when n >> d, solves (X_b^T X_b) theta = X_b^T y,
+                         but squares the condition number of X_b
+            "qr"       - more stable, never forms X_b^T X_b
+            "svd"/"lstsq" - slowest but handles rank-deficient X
+            "auto"     - Cholesky when the problem is well conditioned, SVD otherwise
 
     Returns:
         Weights (theta) for the linear model.
+        If X is rank deficient, the minimum-norm solution is returned.
     """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}, expected one of {SOLVERS}")
+
     # Add a column of ones to X for the intercept term (bias)
     ones = np.ones((X.shape[0], 1))
     X_b = np.hstack((ones, X))
 
-    # Calculate weights using the normal equation: theta = (X_b^T * X_b)^-1 * X_b^T * y
-    # np.linalg.inv computes the inverse of a matrix
+    # We never compute np.linalg.inv(X_b.T @ X_b) explicitly: solving the system
+    # is faster and loses less precision than inverting and multiplying.
     # .T transposes the matrix
     # @ performs matrix multiplication
+    n, d = X_b.shape
     try:
-        theta = np.linalg.inv(X_b.T @ X_b) @ X_b.T @ y
-        return theta
+        if solver == "qr":
+            return solve_qr(X_b, y)
+        if solver == "cholesky" or (solver == "auto" and n >= d):
+            gram = X_b.T @ X_b
+            # In auto mode a badly conditioned gram raises and falls back to the SVD
+            max_cond = None if solver == "cholesky" else 1e10
+            return solve_cholesky(gram, X_b.T @ y, max_cond=max_cond)
     except np.linalg.LinAlgError:
-        print("Error: The matrix is singular. Cannot compute inverse.")
-        return None
+        pass  # singular or badly conditioned: fall through to the SVD solver
+    return solve_lstsq(X_b, y)
+
+
+def ridge_path(X, y, lambdas):
+    """
+    Trains ridge regression for every lambda from a single SVD.
+
+    The intercept is not penalized: X and y are centered, and with the SVD
+    X_c = U S V^T every ridge solution is V diag(s / (s^2 + lambda)) U^T y_c.
+    So each extra lambda only costs O(n*d) instead of a new O(n*d^2) fit.
 
+    Args:
+        X: Feature matrix (numpy array).
+        y: Target vector (numpy array).
+        lambdas: Sequence of ridge strengths (>= 0). Like np.linalg.lstsq, directions
+            with singular value <= eps * max(n, d) * s_max are dropped, so lambda = 0
+            gives the minimum-norm least-squares fit even when X is rank deficient.
 
-def predict(X_test, theta):
+    Returns:
+        (thetas, loo_errors, gcv_errors):
+            thetas     - weights per lambda, shape (L, d+1) (or (L, d+1, k) for 2-D y)
+            loo_errors - leave-one-out mean squared error per lambda
+            gcv_errors - generalized cross-validation error per lambda
+        An error is nan when it is undefined: a fit that interpolates the data (e.g.
+        lambda = 0 with n = d + 1 rows) has leverage h = 1, so 1 - h is 0.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    lambdas = np.asarray(lambdas, dtype=float)
+    n = X.shape[0]
+    Y = y.reshape(n, -1)                      # work with 2-D targets, shape (n, k)
+    x_mean, y_mean = X.mean(axis=0), Y.mean(axis=0)
+    U, s, Vt = np.linalg.svd(X - x_mean, full_matrices=False)
+    if s.size:
+        keep = s > np.finfo(float).eps * max(X.shape) * s[0]   # rcond cutoff, as in lstsq
+        U, s, Vt = U[:, keep], s[keep], Vt[keep]
+    Uty = U.T @ (Y - y_mean)                  # (r, k), shared by every lambda
+    U2 = U ** 2                               # for the diagonal of the hat matrix
+    tol = np.finfo(float).eps * max(X.shape)  # 1 - h below this is rounding error, i.e. 0
+
+    thetas = np.empty((lambdas.size, X.shape[1] + 1, Y.shape[1]))
+    loo_errors = np.empty((lambdas.size,) + Y.shape[1:])
+    gcv_errors = np.empty((lambdas.size,) + Y.shape[1:])
+    for i, lam in enumerate(lambdas):
+        shrink = s ** 2 / (s ** 2 + lam)      # how much each direction survives
+        slope = Vt.T @ ((s / (s ** 2 + lam))[:, None] * Uty)
+        thetas[i, 0] = y_mean - x_mean @ slope
+        thetas[i, 1:] = slope
+        # Hat matrix H = 1/n + U diag(shrink) U^T; only its diagonal and trace are needed
+        resid = (Y - y_mean) - U @ (shrink[:, None] * Uty)
+        h = 1 / n + U2 @ shrink
+        loo_denom = np.where(1 - h > tol, 1 - h, np.nan)
+        gcv_denom = 1 - (1 + shrink.sum()) / n
+        gcv_denom = gcv_denom if gcv_denom > tol else np.nan
+        loo_errors[i] = np.mean((resid / loo_denom[:, None]) ** 2, axis=0)
+        gcv_errors[i] = np.mean(resid ** 2, axis=0) / gcv_denom ** 2
+    if y.ndim == 1:
+        thetas, loo_errors, gcv_errors = thetas[:, :, 0], loo_errors[:, 0], gcv_errors[:, 0]
+    return thetas, loo_errors, gcv_errors
+
+
+def train_linear_regression_sgd(X, y, optimizer="adam", learning_rate=0.01, batch_size=256,
+                                epochs=100, tol=1e-4, patience=3, seed=None, verbose=False):
+    """
+    Trains a linear regression model with mini-batch gradient descent.
+
+    Unlike the normal equation this never builds a d x d matrix, so it works for
+    very wide X (e.g. 50k+ hashed features). X may be a memory-mapped array: each
+    mini-batch is a contiguous slice, and only the batch order is shuffled.
+
+    Args:
+        X: Feature matrix (numpy array or memmap).
+        y: Target vector (numpy array or memmap).
+        optimizer: "adam" or "momentum".
+        learning_rate: Step size.
+        batch_size: Rows per mini-batch.
+        epochs: Maximum number of passes over the data.
+        tol: Stop once the epoch loss improves by less than this fraction ...
+        patience: ... for this many epochs in a row.
+        seed: Seed for the batch order.
+        verbose: Print loss and timing after every epoch.
+
+    Returns:
+        (theta, history): weights for predict() and a list of
+        (epoch, mean squared error, seconds) tuples, one per epoch.
+    """
+    if optimizer not in ("adam", "momentum"):
+        raise ValueError(f"Unknown optimizer {optimizer!r}, expected 'adam' or 'momentum'")
+    rng = np.random.default_rng(seed)
+    n, d = X.shape
+    k = 1 if y.ndim == 1 else y.shape[1]
+    theta = np.zeros((d + 1, k))           # bias in row 0, like train_linear_regression
+    m1 = np.zeros_like(theta)              # momentum / Adam first moment
+    m2 = np.zeros_like(theta)              # Adam second moment
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    history = []
+    best_loss, stale = np.inf, 0
+    starts = np.arange(0, n, batch_size)
+    for epoch in range(1, epochs + 1):
+        t0 = time.perf_counter()
+        total = 0.0
+        for start in rng.permutation(starts):
+            X_batch = np.asarray(X[start:start + batch_size], dtype=float)
+            y_batch = np.asarray(y[start:start + batch_size], dtype=float).reshape(-1, k)
+            resid = X_batch @ theta[1:] + theta[0] - y_batch
+            total += float((resid ** 2).sum())
+            # Gradient of the mean squared error, bias handled without a ones column
+            grad = np.empty_like(theta)
+            grad[0] = 2 * resid.mean(axis=0)
+            grad[1:] = 2 * (X_batch.T @ resid) / X_batch.shape[0]
+            step += 1
+            if optimizer == "momentum":
+                m1 = beta1 * m1 + grad
+                theta -= learning_rate * m1
+            else:
+                m1 = beta1 * m1 + (1 - beta1) * grad
+                m2 = beta2 * m2 + (1 - beta2) * grad ** 2
+                m1_hat = m1 / (1 - beta1 ** step)     # bias-corrected moments
+                m2_hat = m2 / (1 - beta2 ** step)
+                theta -= learning_rate * m1_hat / (np.sqrt(m2_hat) + eps)
+        loss = total / (n * k)
+        seconds = time.perf_counter() - t0
+        history.append((epoch, loss, seconds))
+        if verbose:
+            print(f"epoch {epoch:3d}: loss {loss:.6f} ({seconds:.3f}s)")
+        # Early stopping once the loss stops improving
+        if loss < best_loss * (1 - tol):
+            best_loss, stale = loss, 0
+        else:
+            stale += 1
+            if stale >= patience:
+                break
+    return (theta[:, 0] if y.ndim == 1 else theta), history
+
+
+def predict(X_test, theta, out=None, block_rows=4096):
     """
     Predicts target values using the trained linear regression model.
+
+    Args:
+        X_test: Feature matrix, e.g. a numpy array or a memory-mapped .npy file.
+        theta: Weights from train_linear_regression (bias first).
+        out: Optional preallocated output array (or memmap) to write into.
+        block_rows: Rows scored per step, so each block stays in the CPU cache.
+
+    Returns:
+        The predictions (out, if it was given). They match np.hstack((ones, X_test)) @ theta
+        up to floating-point rounding, not bit for bit: the bias is added after the
+        products instead of first, so results can differ by a few units in the last place
+        of sum(|x_j * theta_j|) (about 1e-15 relative).
+    """
+    # Instead of copying X_test next to a column of ones, apply the bias separately:
+    # [1, X] @ theta = X @ theta[1:] + theta[0] (same math, different rounding order)
+    theta = np.asarray(theta)
+    n = X_test.shape[0]
+    if out is None:
+        out = np.empty((n,) + theta.shape[1:], dtype=np.result_type(X_test, theta, float))
+    for start in range(0, n, block_rows):
+        block = out[start:start + block_rows]                # view, no copy
+        np.matmul(X_test[start:start + block_rows], theta[1:], out=block)
+        block += theta[0]
+    return out
+
+
+def train_linear_regression_batched(X, y, offsets=None):
+    """
+    Trains many independent linear regressions in one vectorized call.
+
+    Args:
+        X: Stacked features, shape (B, n, d). With offsets: all rows, shape (N, d).
+        y: Stacked targets, shape (B, n) or (B, n, k). With offsets: shape (N,) or (N, k).
+        offsets: Optional ragged layout. Problem b uses rows offsets[b]:offsets[b+1],
+            so offsets has B + 1 increasing entries starting at 0 and ending at N.
+
+    Returns:
+        Weights (theta) for every model, shape (B, d+1) or (B, d+1, k).
+        Rank-deficient problems get their minimum-norm solution.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if offsets is not None:
+        # Pad the ragged groups into a (B, n_max, d) stack. Zero rows add nothing
+        # to X^T X or X^T y, and the intercept count comes from the true lengths.
+        offsets = np.asarray(offsets)
+        lengths = np.diff(offsets)
+        group = np.repeat(np.arange(lengths.size), lengths)   # problem id of each row
+        pos = np.arange(X.shape[0]) - offsets[group]          # row index inside its problem
+        X_pad = np.zeros((lengths.size, lengths.max(initial=0), X.shape[1]))
+        y_pad = np.zeros((lengths.size, lengths.max(initial=0)) + y.shape[1:])
+        X_pad[group, pos] = X
+        y_pad[group, pos] = y
+        X, y = X_pad, y_pad
+    else:
+        lengths = np.full(X.shape[0], X.shape[1])
+
+    # Build every (d+1) x (d+1) Gram matrix X_b^T X_b without an hstack copy
+    B, _, d = X.shape
+    Xt = X.transpose(0, 2, 1)                # (B, d, n)
+    col_sums = X.sum(axis=1)                 # (B, d)
+    gram = np.empty((B, d + 1, d + 1))
+    gram[:, 0, 0] = lengths
+    gram[:, 0, 1:] = col_sums
+    gram[:, 1:, 0] = col_sums
+    gram[:, 1:, 1:] = Xt @ X
+    y3 = y if y.ndim == 3 else y[:, :, None]  # batched matmul wants (B, n, k)
+    Xty = np.concatenate((y3.sum(axis=1, keepdims=True), Xt @ y3), axis=1)
+
+    # One batched solve for all B systems; pinv only if some system is singular
+    try:
+        theta = np.linalg.solve(gram, Xty)
+    except np.linalg.LinAlgError:
+        theta = np.linalg.pinv(gram) @ Xty
+    return theta if y.ndim == 3 else theta[:, :, 0]
+
+
+class StreamingLinearRegression:
+    """
+    Fits a linear regression one chunk of rows at a time (out-of-core).
+
+    Only the d x d Gram matrix X_b^T X_b and the vector X_b^T y are kept,
+    so memory is O(d^2) no matter how many rows are streamed through.
+    """
+
+    def __init__(self):
+        self.gram = None   # running X_b^T X_b, shape (d+1, d+1)
+        self.Xty = None    # running X_b^T y,   shape (d+1,) or (d+1, k)
+        self.n_rows = 0
+
+    def partial_fit(self, X_chunk, y_chunk):
+        """Adds a chunk of rows to the running sums and returns self."""
+        X_chunk = np.asarray(X_chunk, dtype=float)
+        y_chunk = np.asarray(y_chunk, dtype=float)
+        d = X_chunk.shape[1]
+        if self.gram is None:
+            self.gram = np.zeros((d + 1, d + 1))
+            self.Xty = np.zeros((d + 1,) + y_chunk.shape[1:])
+        # Same as X_b^T X_b and X_b^T y, but without copying X into a column of ones
+        col_sums = X_chunk.sum(axis=0)
+        self.gram[0, 0] += X_chunk.shape[0]
+        self.gram[0, 1:] += col_sums
+        self.gram[1:, 0] += col_sums
+        self.gram[1:, 1:] += X_chunk.T @ X_chunk
+        self.Xty[0] += y_chunk.sum(axis=0)
+        self.Xty[1:] += X_chunk.T @ y_chunk
+        self.n_rows += X_chunk.shape[0]
+        return self
+
+    def fit(self, chunks):
+        """Calls partial_fit on every (X_chunk, y_chunk) pair from an iterable."""
+        for X_chunk, y_chunk in chunks:
+            self.partial_fit(X_chunk, y_chunk)
+        return self
+
+    def solve(self):
+        """
+        Returns theta for all rows seen so far.
+        A rank-deficient Gram matrix gives the minimum-norm solution.
+        """
+        if self.gram is None:
+            raise ValueError("No data yet: call partial_fit() first")
+        try:
+            return solve_cholesky(self.gram, self.Xty)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(self.gram, self.Xty, rcond=None)[0]
+
+
+class OnlineLinearRegression:
     """
-    # Add a column of ones for the intercept term
-    ones = np.ones((X_test.shape[0], 1))
-    X_test_b = np.hstack((ones, X_test))
+    Keeps a fitted model current as new rows arrive (recursive least squares).
 
-    # Prediction: y_pred = X_test_b * theta
-    predictions = X_test_b @ theta
-    return predictions
+    Holds theta and P = (X_b^T X_b)^-1. Each update uses the Sherman-Morrison
+    (one row) or Woodbury (small batch) identity, costing O(d^2) per row instead
+    of a full refit. With forgetting < 1, old rows are down-weighted so the model
+    can follow drifting data (0.99 ~ "remember the last 100 rows").
+    """
+
+    def __init__(self, X=None, y=None, forgetting=1.0, n_features=None, delta=1e-6):
+        """
+        Args:
+            X, y: Optional initial data to fit with the normal equation.
+            forgetting: Weight kept by old rows at every update (0 < forgetting <= 1).
+            n_features: Number of features when starting without data.
+            delta: Starting without data uses P = I / delta (a weak prior theta ~ 0).
+        """
+        if not 0 < forgetting <= 1:
+            raise ValueError("forgetting must be in (0, 1]")
+        self.forgetting = forgetting
+        if X is not None:
+            model = StreamingLinearRegression().partial_fit(X, y)
+            self.P = np.linalg.pinv(model.gram)   # pinv also copes with singular input
+            self.theta = self.P @ model.Xty
+        elif n_features is not None:
+            self.P = np.eye(n_features + 1) / delta
+            self.theta = np.zeros(n_features + 1)
+        else:
+            raise ValueError("Pass initial X, y or n_features")
+
+    def update(self, X_new, y_new):
+        """Folds new rows into theta and P in place and returns self."""
+        X_new = np.atleast_2d(np.asarray(X_new, dtype=float))
+        y_new = np.asarray(y_new, dtype=float).reshape((X_new.shape[0],) + self.theta.shape[1:])
+        lam = self.forgetting
+        X_b = np.hstack((np.ones((X_new.shape[0], 1)), X_new))   # only m rows, cheap
+        PXt = self.P @ X_b.T                                      # (d+1, m)
+        if X_b.shape[0] == 1:
+            # Sherman-Morrison: the (lam + x^T P x) "matrix" is a single number
+            K = PXt / (lam + X_b @ PXt)
+        else:
+            # Woodbury: invert a small m x m matrix instead of the d x d one
+            S = lam * np.eye(X_b.shape[0]) + X_b @ PXt
+            K = np.linalg.solve(S, PXt.T).T                       # S is symmetric
+        self.theta = self.theta + K @ (y_new - X_b @ self.theta)
+        self.P = (self.P - K @ PXt.T) / lam
+        return self
+
+
+def iter_npy_chunks(X_path, y_path, chunk_rows=100_000):
+    """
+    Yields (X_chunk, y_chunk) pairs from two .npy files without loading them.
+    mmap_mode="r" maps the files, so only the rows being used are read from disk.
+    """
+    X = np.load(X_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+    for start in range(0, X.shape[0], chunk_rows):
+        yield X[start:start + chunk_rows], y[start:start + chunk_rows]
+
+
+def iter_csv_chunks(path, chunk_rows=100_000, delimiter=",", skip_header=False):
+    """
+    Yields (X_chunk, y_chunk) pairs from a numeric CSV file, chunk_rows at a time.
+    The last column is the target y, every other column is a feature.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if skip_header:
+            next(f, None)
+        while True:
+            lines = list(islice(f, chunk_rows))   # next chunk_rows lines (or fewer)
+            if not lines:
+                break
+            block = np.loadtxt(lines, delimiter=delimiter, ndmin=2)
+            yield block[:, :-1], block[:, -1]
 
 
 # --- Run the project ---
@@ -53,17 +452,47 @@ print("--- Starting NumPy Linear Regression Project ---")
 # 2. Train the model
 weights = train_linear_regression(X, y)
 
-if weights is not None:
-    print(f"\nTraining completed.")
-    print(f"Calculated weights (bias, feature_weight):\n{weights.flatten()}")
-    print("\nExpected weights from data generation were close to [4, 3].")
+print(f"\nTraining completed.")
+print(f"Calculated weights (bias, feature_weight):\n{weights.flatten()}")
+print("\nExpected weights from data generation were close to [4, 3].")
+
+# 3. Make a prediction
+X_new = np.array([[0], [2]])  # New data points to predict for
+predictions = predict(X_new, weights)
+
+print(f"\nPredictions for new data points:\n{X_new.flatten()}")
+print(f"Predicted y values:\n{predictions.flatten()}")
+
+# 4. Fit the same model in chunks, as if the data did not fit in memory
+streaming = StreamingLinearRegression()
+for start in range(0, X.shape[0], 25):
+    streaming.partial_fit(X[start:start + 25], y[start:start + 25])
+print(f"\nStreaming weights (4 chunks of 25 rows):\n{streaming.solve().flatten()}")
+
+# 5. Keep the model current as new rows arrive, without refitting everything
+online = OnlineLinearRegression(X[:90], y[:90])
+for i in range(90, 100):
+    online.update(X[i:i + 1], y[i:i + 1])   # O(d^2) per row
+print(f"\nOnline weights (90 rows + 10 updates):\n{online.theta.flatten()}")
+
+# 6. Fit one small model per segment, all in a single batched call
+X_segments = X.reshape(4, 25, 1)           # 4 segments of 25 rows each
+y_segments = y.reshape(4, 25, 1)
+segment_weights = train_linear_regression_batched(X_segments, y_segments)
+print(f"\nPer-segment weights (bias, feature_weight):\n{segment_weights[:, :, 0]}")
 
-    # 3. Make a prediction
-    X_new = np.array([[0], [2]])  # New data points to predict for
-    predictions = predict(X_new, weights)
+# 7. Sweep ridge strengths and let leave-one-out error pick the best one
+lambdas = np.logspace(-3, 3, 7)
+ridge_weights, loo_errors, gcv_errors = ridge_path(X, y, lambdas)
+best = np.argmin(loo_errors)
+print(f"\nBest ridge lambda {lambdas[best]:g} (LOO MSE {loo_errors[best].item():.4f}), "
+      f"weights:\n{ridge_weights[best].flatten()}")
 
-    print(f"\nPredictions for new data points:\n{X_new.flatten()}")
-    print(f"Predicted y values:\n{predictions.flatten()}")
+# 8. Train with mini-batch gradient descent instead of the normal equation
+sgd_weights, sgd_history = train_linear_regression_sgd(X, y, learning_rate=0.05,
+                                                       batch_size=16, seed=42)
+print(f"\nSGD weights after {len(sgd_history)} epochs "
+      f"(loss {sgd_history[-1][1]:.4f}):\n{sgd_weights.flatten()}")
 
 print("\n--- Project Finished ---")
 
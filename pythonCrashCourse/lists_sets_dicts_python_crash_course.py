@@ -214,6 +214,228 @@ print(counts)    # {'a': 3, 'b': 2, 'c': 1}
 
 # 3) Sorting results (optional)
 print(sorted(counts.items(), key=lambda kv: kv[1], reverse=True))  # by value desc
+
+# 4) Counting words at scale
+# For big jobs the loop above does two dict lookups per word (get + store), and sorting
+# every (word, count) pair just to show the top few costs O(u log u).
+#  - collections.Counter.update(words) counts a whole list of words in C
+#  - heapq.nlargest(k, ...) keeps only k items in a small heap: O(u log k)
+#  - big files are cut into byte-range shards that worker processes count in parallel,
+#    and the partial Counters are added together at the end
+#  - for billions of distinct words, CountMinSketch keeps a fixed-size table of counters
+#    plus a small set of "heavy hitters" instead of one dict entry per word
+# The counting code lives in wordcount.py. Here every shard is counted in this process;
+# `python wordcount.py` runs the same demo with the shards spread over worker processes.
+from wordcount import count_words, count_words_approx, top_k
+
+with open("words_demo.txt", "w", encoding="utf-8") as f:
+    for i in range(2000):
+        f.write("a b a c a b\n" if i % 2 else "the quick brown fox jumps over the lazy dog\n")
+
+exact = count_words(["words_demo.txt"], shard_bytes=4096)
+print("top 3 (exact): ", top_k(exact, 3))
+sketch = count_words_approx(["words_demo.txt"], width=1024, heavy=5, shard_bytes=4096)
+print("top 3 (sketch):", top_k(sketch, 3))
+
+# 5) Compact key -> number store (tens of millions of keys)
+# A dict of str -> int/float keeps a separate Python object for every key AND every
+# value, plus the hash table: well over 100 bytes per entry. CompactStore keeps
+#  - the keys as one sorted, fixed-width bytes array (found by binary search)
+#  - the values as one typed NumPy array (8 bytes each for int64/float64)
+# New keys wait in a small dict and are merged in bulk, so inserts stay cheap.
+# Items come out in key order (not insertion order like a dict).
+# NumPy's "S" dtype pads with NUL bytes and strips them on read, so keys that end
+# in "\x00" can't round-trip and are rejected.
+import sys
+from itertools import islice
+import numpy as np
+
+def encode_key(key):
+    """utf-8 bytes for a CompactStore key; rejects keys a fixed-width "S" array would mangle."""
+    kb = key.encode("utf-8")
+    if kb.endswith(b"\x00"):
+        raise ValueError(f"CompactStore keys can't end with a NUL character: {key!r}")
+    return kb
+
+class CompactStore:
+    """Memory-compact str -> number mapping with dict-style methods and bulk updates."""
+
+    def __init__(self, data=None, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.keys_arr = np.array([], dtype="S1")      # sorted utf-8 keys
+        self.values = np.array([], dtype=self.dtype)  # values[i] belongs to keys_arr[i]
+        self.alive = np.array([], dtype=bool)         # False once a key is popped
+        self.pending = {}                             # recently added keys, not merged yet
+        self.n_alive = 0
+        if data:
+            self.update(data)
+
+    def find(self, key):
+        """Index of key in keys_arr, or -1."""
+        kb = key.encode("utf-8")
+        if len(kb) > self.keys_arr.dtype.itemsize or kb.endswith(b"\x00"):
+            return -1                                  # too long (or NUL-ended) to be stored
+        i = int(np.searchsorted(self.keys_arr, kb))
+        if i < len(self.keys_arr) and self.keys_arr[i] == kb and self.alive[i]:
+            return i
+        return -1
+
+    def compact(self):
+        """Merges pending keys into the sorted arrays and drops popped keys."""
+        if not self.pending and self.n_alive == len(self.keys_arr):
+            return
+        keys = np.concatenate((self.keys_arr[self.alive],
+                               np.array([k.encode("utf-8") for k in self.pending], dtype="S")))
+        values = np.concatenate((self.values[self.alive],
+                                 np.fromiter(self.pending.values(), self.dtype, len(self.pending))))
+        order = np.argsort(keys, kind="stable")
+        self.keys_arr, self.values = keys[order], values[order]
+        self.alive = np.ones(len(keys), dtype=bool)
+        self.n_alive = len(keys)
+        self.pending = {}
+
+    def __len__(self):
+        return self.n_alive + len(self.pending)
+
+    def __contains__(self, key):
+        return key in self.pending or self.find(key) >= 0
+
+    def __getitem__(self, key):
+        if key in self.pending:
+            return self.pending[key].item()
+        i = self.find(key)
+        if i < 0:
+            raise KeyError(key)
+        return self.values[i].item()                   # plain Python int/float
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        i = self.find(key)
+        if i >= 0:
+            self.values[i] = value                     # existing key: update in place
+            return
+        encode_key(key)                                # check before it reaches the arrays
+        self.pending[key] = self.dtype.type(value)     # cast now, same as values[i] = value
+        if len(self.pending) > max(1024, len(self.keys_arr) // 8):
+            self.compact()                             # merge new keys in bulk
+
+    def update(self, other, batch_size=100_000):
+        """
+        Like dict.update: takes a mapping or an iterable of (key, value) pairs.
+        Pairs are handled batch_size at a time with one vectorized search per batch.
+        """
+        pairs = iter(other.items() if hasattr(other, "items") else other)
+        while True:
+            batch = dict(islice(pairs, batch_size))        # later duplicates win, like dict
+            if not batch:
+                return
+            self.compact()
+            keys = list(batch)
+            kb = np.array([encode_key(k) for k in keys], dtype="S")
+            values = np.fromiter(batch.values(), self.dtype, len(batch))
+            n = len(self.keys_arr)
+            idx = np.searchsorted(self.keys_arr, kb) if n else np.zeros(len(kb), dtype=np.intp)
+            clipped = np.minimum(idx, max(n - 1, 0))
+            found = (idx < n) & (self.keys_arr[clipped] == kb) & self.alive[clipped] if n \
+                else np.zeros(len(kb), dtype=bool)
+            self.values[idx[found]] = values[found]         # existing keys: one vectorized write
+            # New keys: sort them, then insert them all at their sorted positions at once
+            new = np.flatnonzero(~found)
+            order = np.argsort(kb[new], kind="stable")
+            new, at = new[order], idx[new][order]
+            if kb.dtype.itemsize > self.keys_arr.dtype.itemsize:
+                self.keys_arr = self.keys_arr.astype(kb.dtype)    # widen for longer keys
+            self.keys_arr = np.insert(self.keys_arr, at, kb[new])
+            self.values = np.insert(self.values, at, values[new])
+            self.alive = np.insert(self.alive, at, True)
+            self.n_alive += len(new)
+
+    def pop(self, key, *default):
+        if key in self.pending:
+            return self.pending.pop(key).item()
+        i = self.find(key)
+        if i < 0:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        self.alive[i] = False                          # mark as gone, removed on compact()
+        self.n_alive -= 1
+        return self.values[i].item()
+
+    def __delitem__(self, key):
+        self.pop(key)
+
+    def items(self):
+        self.compact()
+        for kb, value in zip(self.keys_arr.tolist(), self.values.tolist()):
+            yield kb.decode("utf-8"), value
+
+    def keys(self):
+        return (key for key, _ in self.items())
+
+    def __iter__(self):
+        return self.keys()
+
+    def bulk_update(self, func, where=None):
+        """
+        Vectorized update of many values at once: values = func(values) where where(values).
+        e.g. 10% off every price >= 1.0:
+            prices.bulk_update(lambda v: np.round(v * 0.9, 2), where=lambda v: v >= 1.0)
+        """
+        self.compact()
+        mask = np.ones(len(self.values), dtype=bool) if where is None else where(self.values)
+        self.values[mask] = func(self.values[mask])
+
+    def nbytes(self):
+        self.compact()
+        return self.keys_arr.nbytes + self.values.nbytes + self.alive.nbytes
+
+    def save(self, path):
+        """Writes path.keys.npy and path.values.npy."""
+        self.compact()
+        np.save(f"{path}.keys.npy", self.keys_arr)
+        np.save(f"{path}.values.npy", self.values)
+
+    @classmethod
+    def load(cls, path, mmap_mode="c"):
+        """
+        Opens a saved store with memory-mapped arrays, so loading is instant.
+        mmap_mode "c" keeps changes in memory only, "r+" writes them back to the files.
+        """
+        store = cls()
+        store.keys_arr = np.load(f"{path}.keys.npy", mmap_mode=mmap_mode)
+        store.values = np.load(f"{path}.values.npy", mmap_mode=mmap_mode)
+        store.dtype = store.values.dtype
+        store.alive = np.ones(len(store.keys_arr), dtype=bool)
+        store.n_alive = len(store.keys_arr)
+        return store
+
+# Same operations as the inventory / prices examples above
+stock = CompactStore({"apple": 3, "banana": 1}, dtype=np.int64)
+stock["banana"] = 4
+print(stock.get("pear", 0), "banana" in stock, stock.pop("apple", 0), dict(stock.items()))
+
+prices_store = CompactStore({"apple": 1.2, "banana": 0.5, "cherry": 2.1})
+prices_store.bulk_update(lambda v: np.round(v * 0.9, 2), where=lambda v: v >= 1.0)
+print(dict(prices_store.items()))  # {'apple': 1.08, 'banana': 0.5, 'cherry': 1.89}
+prices_store.save("prices_demo")
+print(CompactStore.load("prices_demo")["cherry"])
+
+# Memory: one million SKUs in a dict vs a CompactStore
+sku_dict = {f"SKU{i:09d}": float(i) for i in range(1_000_000)}
+dict_bytes = sys.getsizeof(sku_dict) + sum(sys.getsizeof(k) + sys.getsizeof(v)
+                                           for k, v in sku_dict.items())
+sku_store = CompactStore(dtype=np.float64)
+sku_store.update((f"SKU{i:09d}", float(i)) for i in range(1_000_000))
+print(f"dict: {dict_bytes / 1e6:.0f} MB, CompactStore: {sku_store.nbytes() / 1e6:.0f} MB")
+del sku_dict, sku_store
+
+
 # ========================================
 # Dict Practice !!!
 # ========================================
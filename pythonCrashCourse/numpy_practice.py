@@ -172,24 +172,216 @@ tmp = np.arange(50000)                   # [0 1 2 3 4... 50000]
 np.save("demo.npy", tmp)             # save in NumPy binary format (.npy)
 print("npy load:", np.load("demo.npy"))       # load the .npy file
 
+# np.load reads the WHOLE array into RAM. For arrays of tens of GB, memory-map instead:
+# the OS only reads the pages you actually touch, so opening is instant and slicing is lazy.
+def open_npy(path, mode="r"):
+    """Opens a .npy file as a read-only memory map (mode="r+" to write in place)."""
+    return np.load(path, mmap_mode=mode)
+
+def iter_chunks(arr, chunk_rows=1_000_000):
+    """Yields fixed-size row views of arr (the last one may be shorter) without copying."""
+    for start in range(0, arr.shape[0], chunk_rows):
+        yield arr[start:start + chunk_rows]   # slicing a memmap is a view, not a read
+
+big = open_npy("demo.npy")                    # nothing read from disk yet
+print("memmap slice:", big[1000:1005])        # only the page(s) holding these rows are read
+print("copy of a slice:", np.array(big[10:15]))        # np.array(...) pulls a slice into RAM
+chunk_total = sum(int(chunk.sum()) for chunk in iter_chunks(big, 8192))  # bounded memory
+print("chunked sum:", chunk_total, "== np.sum:", chunk_total == tmp.sum())
+
 np.savetxt("demo.csv", np.arange(6).reshape(3,2), delimiter=",", fmt="%d")  # write CSV
 print("wrote demo.csv")              # confirm CSV write
 
+# np.savetxt formats one row at a time and np.loadtxt parses one line at a time in Python.
+# For multi-GB numeric CSVs we work on big blocks instead: read many MB of bytes at once,
+# let NumPy's C parser convert every field in the block, and format whole blocks on write.
+import re
+import warnings
+
+def read_csv_chunks(path, chunk_rows=100_000, dtype=float, delimiter=",", block_size=1 << 24):
+    """
+    Yields a numeric CSV file as 2-D arrays of chunk_rows rows (the last may be shorter).
+
+    Args:
+        path: CSV file with the same number of numeric columns on every line (no header).
+        chunk_rows: Rows per yielded chunk.
+        dtype: NumPy dtype for the values.
+        delimiter: Field separator.
+        block_size: Bytes read from disk per step.
+
+    Raises ValueError naming the first bad line (wrong column count, blank line,
+    empty field or non-numeric value). Blank lines are only allowed at the end.
+    """
+    sep = delimiter.encode()
+    ncols = None
+    rows = np.empty((0, 0), dtype=dtype)     # parsed rows waiting to be yielded
+    leftover = b""                           # partial last line of the previous block
+    first_line = 1                           # line number (in the file) of the block's first line
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            data = leftover + block
+            if b"\r" in data:
+                data = data.replace(b"\r\n", b"\n")      # Windows line endings
+            if block:
+                # Only parse complete lines, and hold back trailing newlines: they are
+                # blank lines (an error) unless nothing but more newlines follows them
+                end = len(data)
+                while end and data[end - 1] == ord("\n"):
+                    end -= 1
+                cut = data.rfind(b"\n", 0, end)
+                if cut < 0:
+                    data, leftover = None, data     # no complete line yet
+                else:
+                    data, leftover = data[:cut], data[cut + 1:]
+            else:
+                data = data.rstrip()            # end of file: trailing blank lines are fine
+            if data is not None and (data or block):
+                if ncols is None:
+                    ncols = data.split(b"\n", 1)[0].count(sep) + 1
+                    rows = rows.reshape(0, ncols)
+                nlines = data.count(b"\n") + 1
+                # Cheap bulk checks first: the same number of delimiters on every line
+                # (counted for the whole block at once) and no blank lines or empty fields
+                values = None
+                if data.count(sep) == nlines * (ncols - 1) and not has_empty_field(data, sep):
+                    # Turn newlines into delimiters and parse the whole block in C
+                    values = parse_numbers(data.replace(b"\n", sep), dtype, delimiter)
+                if values is None or values.size != nlines * ncols:
+                    raise csv_line_error(path, data, first_line, ncols, dtype, delimiter)
+                rows = np.concatenate((rows, values.reshape(nlines, ncols)))
+                first_line += nlines
+            while rows.shape[0] >= chunk_rows or (not block and rows.shape[0]):
+                yield rows[:chunk_rows]
+                rows = rows[chunk_rows:]
+            if not block:
+                break
+
+def parse_numbers(data, dtype, delimiter):
+    """np.fromstring, or None if part of data isn't a number."""
+    try:
+        with warnings.catch_warnings():
+            # Older NumPy warns and returns the numbers parsed so far instead of raising
+            warnings.simplefilter("error", DeprecationWarning)
+            return np.fromstring(data, dtype=dtype, sep=delimiter)
+    except (ValueError, DeprecationWarning):
+        return None
+
+def has_empty_field(data, sep):
+    """True if data has a blank line or a field that is empty / only spaces."""
+    if b"\n\n" in data or not data or data.isspace():
+        return True
+    # np.fromstring reads a blank field like " " as -1, so look closer when there is whitespace
+    return (b" " in data or b"\t" in data) and re.search(
+        rb"(?:^|%s)[ \t\r]*(?:%s|$)" % (re.escape(sep), re.escape(sep)), data, re.M) is not None
+
+def csv_line_error(path, data, first_line, ncols, dtype, delimiter):
+    """ValueError naming the first line of data that isn't ncols numbers."""
+    sep = delimiter.encode()
+    for lineno, line in enumerate(data.split(b"\n"), first_line):
+        fields = line.split(sep)
+        if not line.strip():
+            return ValueError(f"{path}, line {lineno}: blank line")
+        if len(fields) != ncols:
+            return ValueError(f"{path}, line {lineno}: expected {ncols} columns, got {len(fields)}")
+        if not all(field.strip() for field in fields):
+            return ValueError(f"{path}, line {lineno}: empty field")
+        values = parse_numbers(line, dtype, delimiter)
+        if values is None or values.size != ncols:
+            return ValueError(f"{path}, line {lineno}: not numeric: {line.decode(errors='replace')!r}")
+    return ValueError(f"{path}: expected {ncols} numeric columns on every line")
+
+def write_csv(path, chunks, fmt="%.18e", delimiter=",", mode="w"):
+    """
+    Writes 2-D array chunks to a CSV file, formatting each whole chunk in one step.
+    chunks can be a single 2-D array or any iterable of 2-D arrays (e.g. a generator).
+    """
+    if isinstance(chunks, np.ndarray):
+        chunks = [chunks]
+    with open(path, mode, encoding="utf-8") as f:
+        for chunk in chunks:
+            chunk = np.atleast_2d(chunk)
+            row_fmt = delimiter.join([fmt] * chunk.shape[1]) + "\n"
+            f.write((row_fmt * chunk.shape[0]) % tuple(chunk.ravel().tolist()))
+
+# Quick benchmark against np.savetxt / np.loadtxt
+import time
+bench = np.random.randint(0, 1000, (200_000, 4))
+t0 = time.perf_counter(); np.savetxt("bench.csv", bench, delimiter=",", fmt="%d")
+t1 = time.perf_counter(); write_csv("bench.csv", bench, fmt="%d")
+t2 = time.perf_counter(); loaded = np.loadtxt("bench.csv", delimiter=",", dtype=np.int64)
+t3 = time.perf_counter(); chunked = np.concatenate(list(read_csv_chunks("bench.csv", dtype=np.int64)))
+t4 = time.perf_counter()
+print(f"write: savetxt {t1 - t0:.3f}s vs write_csv {t2 - t1:.3f}s")
+print(f"read:  loadtxt {t3 - t2:.3f}s vs read_csv_chunks {t4 - t3:.3f}s, same data: {np.array_equal(loaded, chunked)}")
+
 # ********************** 10) MINI PROJECT: DICE SIMULATION **********************
 
-N = 1000000000                      # number of simulated trials
-die1 = np.random.randint(1, 7, N)    # N rolls of die 1 (values 1..6)
-die2 = np.random.randint(1, 7, N)    # N rolls of die 2 (values 1..6)
-sums = die1 + die2                   # vectorized pairwise sum of dice
+# The naive version below builds die1, die2 and sums as full int64 arrays.
+# For N = 1,000,000,000 that is more than 24 GB of RAM before np.unique even runs!
+#   die1 = np.random.randint(1, 7, N)
+#   die2 = np.random.randint(1, 7, N)
+#   sums = die1 + die2
+#   values, counts = np.unique(sums, return_counts=True)
+# Instead we roll the dice in fixed-size chunks and only keep a running histogram,
+# so peak memory depends on chunk_size and NOT on N.
+
+# simulate_dice lives in dice_sim.py. Run `python dice_sim.py` to split the trials across
+# every core: worker processes re-run the script that started them, so the pool is
+# started from that small file instead of from this tutorial.
+from dice_sim import simulate_dice
+
+
+# We don't always need to roll every die. The exact distribution of the sum of k dice
+# is the single-die distribution convolved with itself k times. And a histogram of N
+# simulated sums is just ONE multinomial draw over those probabilities, so its cost
+# depends on the number of possible sums, not on N (N = 10**12 takes milliseconds).
+
+def exact_dice_distribution(k=2, sides=6):
+    """
+    Computes the exact distribution of the sum of k fair dice with the given sides.
+
+    Returns:
+        (values, probs, p_max): the possible sums k..k*sides, their probabilities,
+        and the probability that at least one die shows its highest face.
+    """
+    face = np.full(sides, 1 / sides)        # one die: every face equally likely
+    probs = np.array([1.0])                 # zero dice: sum is 0 with probability 1
+    for _ in range(k):
+        probs = np.convolve(probs, face)    # add one more die to the sum
+    values = np.arange(k, k * sides + 1)    # possible sums
+    p_max = 1 - ((sides - 1) / sides) ** k  # 1 - P(no die shows the top face)
+    return values, probs, p_max
+
+def sample_dice_distribution(N, k=2, sides=6, seed=None):
+    """
+    Samples the histogram of N dice-sum trials directly with one multinomial draw.
+
+    Returns:
+        (values, probs, p_max) estimated from N trials, like simulate_dice().
+        p_max is drawn from its own binomial, so it is not tied to the histogram.
+    """
+    rng = np.random.default_rng(seed)
+    values, exact, p_max = exact_dice_distribution(k, sides)
+    counts = rng.multinomial(N, exact)      # counts per sum, O(number of sums)
+    max_count = rng.binomial(N, p_max)      # trials where some die shows the top face
+    return values, counts / N, max_count / N
 
-values, counts = np.unique(sums, return_counts=True)  # unique sums + their counts
-probs = counts / N                   # convert counts to probabilities
+
+N = 1000000000                      # number of simulated trials
+values, probs, max_is_6 = simulate_dice(N, seed=0)   # one process, chunk by chunk
 for v, p in zip(values, probs):      # iterate over each sum and probability
     print(f"Sum {v:>2}: {p:.3f}")    # print nicely formatted probability per sum
 
-max_is_6 = np.mean((die1 == 6) | (die2 == 6))         # proportion where at least one die is 6
 print(f"P(max die = 6) ≈ {max_is_6:.3f}")             # print estimated probability
 
+# Validate the simulation against the exact answer, then try a huge sampled run
+values, exact, p_max = exact_dice_distribution(k=2, sides=6)
+print("max |simulated - exact| =", np.abs(probs - exact).max())
+print(f"exact P(max die = 6) = {p_max:.3f}")
+values, sampled, _ = sample_dice_distribution(10**12, seed=0)
+print("N = 10**12 sampled:", np.round(sampled, 4))
+
 
 # ********************** 11) More Questions **********************
 # https://www.geeksforgeeks.org/python/python-numpy-practice-exercises-questions-and-solutions/
\ No newline at end of file
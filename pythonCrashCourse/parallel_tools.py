@@ -0,0 +1,86 @@
+# ********************** PARALLEL MAP / FILTER / REDUCE **********************
+# The process-pool versions of map, filter and reduce from lambda_Functions.py.
+# The input is cut into chunks and a pool of processes works on the chunks at the same time.
+#  - functions sent to other processes must be picklable: named module-level functions
+#    work, lambdas do not
+#  - small inputs (or workers=1) just run serially, so short calls don't pay to start a pool
+#  - reduce needs an ASSOCIATIVE function ((a+b)+c == a+(b+c)): each chunk is reduced
+#    on its own, then the partial results are combined pairwise in a tree
+from functools import reduce
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+
+def map_chunk(func, chunk):
+    return list(map(func, chunk))
+
+def filter_chunk(func, chunk):
+    return list(filter(func, chunk))
+
+def reduce_chunk(func, chunk):
+    return reduce(func, chunk)
+
+def split_chunks(iterable, workers, chunk_size, min_parallel):
+    """
+    Returns (chunks, parallel): the input cut into lists, and whether it is big enough
+    to be worth a process pool. chunk_size=None picks ~4 chunks per worker.
+    """
+    items = iterable if isinstance(iterable, (list, tuple, range)) else list(iterable)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(items) // (workers * 4)))   # ceil division
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    return chunks, len(items) >= min_parallel and len(chunks) > 1
+
+def run_chunks(worker, func, iterable, workers, chunk_size, ordered, min_parallel):
+    workers = workers or os.cpu_count()
+    chunks, parallel = split_chunks(iterable, workers, chunk_size, min_parallel)
+    if not parallel or workers == 1:
+        return [worker(func, chunk) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            return list(pool.map(worker, [func] * len(chunks), chunks))
+        futures = [pool.submit(worker, func, chunk) for chunk in chunks]
+        return [future.result() for future in as_completed(futures)]   # finish order
+
+def parallel_map(func, iterable, workers=None, chunk_size=None, ordered=True, min_parallel=10_000):
+    """Like list(map(func, iterable)), spread over processes."""
+    results = run_chunks(map_chunk, func, iterable, workers, chunk_size, ordered, min_parallel)
+    return list(chain.from_iterable(results))
+
+def parallel_filter(func, iterable, workers=None, chunk_size=None, ordered=True, min_parallel=10_000):
+    """Like list(filter(func, iterable)), spread over processes."""
+    results = run_chunks(filter_chunk, func, iterable, workers, chunk_size, ordered, min_parallel)
+    return list(chain.from_iterable(results))
+
+def parallel_reduce(func, iterable, workers=None, chunk_size=None, min_parallel=10_000):
+    """Like reduce(func, iterable) for an associative func, using a parallel tree reduction."""
+    workers = workers or os.cpu_count()
+    chunks, parallel = split_chunks(iterable, workers, chunk_size, min_parallel)
+    if not chunks:
+        raise TypeError("parallel_reduce() of empty iterable with no initial value")
+    if not parallel or workers == 1:
+        return reduce(func, chain.from_iterable(chunks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(reduce_chunk, [func] * len(chunks), chunks))
+        # Tree: combine neighbours (keeps the order) until one value is left
+        while len(partials) > 1:
+            pairs = [partials[i:i + 2] for i in range(0, len(partials), 2)]
+            partials = list(pool.map(reduce_chunk, [func] * len(pairs), pairs))
+    return partials[0]
+
+# Run this file directly to try them with two worker processes. The workers look these demo
+# functions up by name, so they are defined at module level.
+def square(x):
+    return x * x
+
+def is_odd(x):
+    return x % 2 != 0
+
+def add(x, y):
+    return x + y
+
+if __name__ == "__main__":
+    big = range(200_000)
+    print("parallel_map == map:", parallel_map(square, big, workers=2) == list(map(square, big)))
+    print("parallel_filter == filter:", parallel_filter(is_odd, big, workers=2) == list(filter(is_odd, big)))
+    print("parallel_reduce:", parallel_reduce(add, big, workers=2), "reduce:", reduce(add, big))
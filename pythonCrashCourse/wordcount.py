@@ -0,0 +1,170 @@
+# ********************** WORD COUNTING AT SCALE **********************
+# The word counter from section 4 of lists_sets_dicts_python_crash_course.py.
+# Files are cut into byte-range shards; each shard is counted with a Counter (exact) or a
+# CountMinSketch (fixed memory), in worker processes when workers > 1, and the partial
+# results are merged at the end.
+import heapq
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from itertools import islice
+from operator import itemgetter
+import numpy as np
+
+def file_shards(paths, shard_bytes=64 << 20):
+    """Cuts files into (path, start, end) byte ranges of about shard_bytes each."""
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, size, shard_bytes):
+            yield path, start, min(start + shard_bytes, size)
+
+def read_shard_words(path, start, end, encoding="utf-8"):
+    """Returns the words of every line that STARTS inside [start, end) of the file."""
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()                 # skip the line that began in the previous shard
+        pos = f.tell()
+        data = f.read(max(0, end - pos))
+        if data and not data.endswith(b"\n"):
+            data += f.readline()         # finish the last line, even past `end`
+    return data.decode(encoding, errors="replace").split()
+
+def count_shard(path, start, end, encoding="utf-8"):
+    return Counter(read_shard_words(path, start, end, encoding))
+
+def map_shards(func, shards, workers, *args):
+    """Runs func(path, start, end, *args) for every shard, in worker processes if workers > 1."""
+    shards = list(shards)
+    if workers <= 1 or len(shards) <= 1:
+        return [func(*shard, *args) for shard in shards]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, *zip(*shards), *([arg] * len(shards) for arg in args)))
+
+def count_words(paths, workers=1, shard_bytes=64 << 20, encoding="utf-8"):
+    """Exact word counts for a list of files, as one merged Counter."""
+    total = Counter()
+    for partial in map_shards(count_shard, file_shards(paths, shard_bytes), workers, encoding):
+        total.update(partial)            # adds counts (C loop over the partial)
+    return total
+
+def top_k(counts, k=10):
+    """The k most frequent (word, count) pairs, using a bounded heap instead of a sort."""
+    if isinstance(counts, CountMinSketch):
+        return counts.top(k)
+    return heapq.nlargest(k, counts.items(), key=itemgetter(1))
+
+class CountMinSketch:
+    """
+    Approximate counts in fixed memory: depth rows of width counters.
+
+    Each word bumps one counter per row (picked by a hash); its estimate is the
+    smallest of those counters, which can only overestimate. Sketches with the same
+    width/depth can be merged by adding tables. The `heavy` most frequent words seen
+    so far are tracked by name so top-k can be answered.
+
+    Words are handled in batches: a Counter collapses repeats, then every distinct
+    word in the batch is hashed once and all counters are updated with NumPy.
+    """
+
+    def __init__(self, width=1 << 20, depth=4, heavy=100):
+        self.width, self.depth, self.heavy = width, depth, heavy
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.rows = np.arange(depth)[:, None]          # row index for fancy indexing
+        self.candidates = {}                           # heavy-hitter word -> estimate
+        self.threshold = 0                             # smallest candidate once full
+        self.total = 0
+
+    def columns(self, words):
+        """(depth, len(words)) counter columns for a list of words."""
+        # One stable 128-bit hash per word (Python's hash() differs between processes),
+        # split into two halves for double hashing: row i uses (h1 + i * h2) % width
+        digests = b"".join(blake2b(w.encode("utf-8"), digest_size=16).digest() for w in words)
+        h = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+        steps = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h[:, 0] + steps * (h[:, 1] | np.uint64(1))) % np.uint64(self.width)).astype(np.intp)
+
+    def add_counts(self, counts):
+        """Adds a {word: count} mapping (e.g. a Counter of one batch)."""
+        if not counts:
+            return
+        words = list(counts)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(words))
+        cols = self.columns(words)
+        for row in range(self.depth):
+            np.add.at(self.table[row], cols[row], values)   # handles repeated columns
+        self.total += int(values.sum())
+        self.track(words, self.table[self.rows, cols].min(axis=0))
+
+    def add(self, word, count=1):
+        self.add_counts({word: count})
+
+    def update(self, words, batch_size=100_000):
+        words = iter(words)
+        while True:
+            batch = Counter(islice(words, batch_size))
+            if not batch:
+                return
+            self.add_counts(batch)
+
+    def estimate(self, word):
+        cols = self.columns([word])
+        return int(self.table[self.rows, cols].min())
+
+    def track(self, words, estimates):
+        """Keeps the `heavy` words with the largest estimates."""
+        # Only words that beat the current smallest candidate can change the set,
+        # so most of a batch is skipped with one vectorized comparison
+        if len(self.candidates) >= self.heavy:
+            hits = np.flatnonzero(estimates > self.threshold)
+        else:
+            hits = range(len(words))
+        for i in hits:
+            self.candidates[words[i]] = int(estimates[i])
+        if len(self.candidates) > self.heavy:
+            self.candidates = dict(heapq.nlargest(self.heavy, self.candidates.items(),
+                                                  key=itemgetter(1)))
+        if len(self.candidates) >= self.heavy:
+            self.threshold = min(self.candidates.values())
+
+    def merge(self, other):
+        """Adds another sketch (same width and depth) into this one."""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Can only merge sketches with the same width and depth")
+        np.add(self.table, other.table, out=self.table)
+        self.total += other.total
+        words = list(set(self.candidates) | set(other.candidates))
+        self.candidates, self.threshold = {}, 0
+        if words:
+            self.track(words, self.table[self.rows, self.columns(words)].min(axis=0))
+        return self
+
+    def top(self, k=10):
+        return heapq.nlargest(k, self.candidates.items(), key=itemgetter(1))
+
+def sketch_shard(path, start, end, encoding, width, depth, heavy):
+    sketch = CountMinSketch(width, depth, heavy)
+    sketch.update(read_shard_words(path, start, end, encoding))
+    return sketch
+
+def count_words_approx(paths, width=1 << 20, depth=4, heavy=100, workers=1,
+                       shard_bytes=64 << 20, encoding="utf-8"):
+    """Approximate word counts in fixed memory, as one merged CountMinSketch."""
+    sketches = map_shards(sketch_shard, file_shards(paths, shard_bytes), workers,
+                          encoding, width, depth, heavy)
+    merged = sketches[0] if sketches else CountMinSketch(width, depth, heavy)
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    return merged
+
+# Run this file directly to count the demo file's shards in worker processes
+if __name__ == "__main__":
+    with open("words_demo.txt", "w", encoding="utf-8") as f:
+        for i in range(2000):
+            f.write("a b a c a b\n" if i % 2 else "the quick brown fox jumps over the lazy dog\n")
+
+    exact = count_words(["words_demo.txt"], workers=2, shard_bytes=4096)
+    print("top 3 (exact): ", top_k(exact, 3))
+    sketch = count_words_approx(["words_demo.txt"], width=1024, heavy=5, workers=2, shard_bytes=4096)
+    print("top 3 (sketch):", top_k(sketch, 3))